@@ -17,14 +17,19 @@
 """
 import concurrent.futures
 import itertools
+import multiprocessing
 import os
 import sys
+from collections.abc import Iterable
 
-import diskcache
-from sympy.abc import x, y
+# single-threaded linear algebra in worker processes (must be set before importing NumPy)
+os.environ.setdefault("OMP_NUM_THREADS", "1")
 
-import qldpc
-import qldpc.cache
+import diskcache  # noqa: E402
+from sympy.abc import x, y  # noqa: E402
+
+import qldpc  # noqa: E402
+import qldpc.cache  # noqa: E402
 
 MIN_ORDER = 3  # minimum cyclic group order
 MIN_RATE = 1 / 36  # ignore codes with lower encoding rates
@@ -33,6 +38,10 @@ NUM_TRIALS = 1000  # for code distance calculations
 CACHE_DIR = os.path.dirname(__file__)
 CACHE_NAME = ".code_cache"
 
+# cache key and code parameters computed by a single job
+JobKey = tuple[tuple[int, int], tuple[int, int, int, int], int]
+JobResult = tuple[JobKey, tuple[int, int, int | None]]
+
 
 def get_quasi_cyclic_code_params(
     dims: tuple[int, int],
@@ -64,37 +73,48 @@ def get_quasi_cyclic_code_params(
     return code.num_qubits, code.dimension, distance
 
 
-def run_and_save(
+def run_job(
     dims: tuple[int, int],
     exponents: tuple[int, int, int, int],
     min_rate: float,
     num_trials: int,
-    cache: diskcache.Cache,
     *,
     silent: bool = False,
-) -> None:
-    """Compute and save bivariate bicycle code parameters."""
+) -> JobResult:
+    """Compute bivariate bicycle code parameters, and return them together with their cache key.
+
+    Results are saved to the cache by the main process, which avoids contention between workers
+    writing to the same cache.
+    """
     if not silent and exponents[2:] == (1, 0):
         print(dims, exponents)
 
-    key = (dims, exponents, num_trials)
-
-    # check whether we already have data for this code
-    if key in cache:
-        nn, kk, dd = cache[key]
-        # if we know the distance or the encoding rate is too low, there's nothing more to do
-        if dd is not None or kk < nn * min_rate:
-            return None
-
-    # compute and save code parameters
+    # compute code parameters
     params = get_quasi_cyclic_code_params(dims, exponents, min_rate, num_trials, silent=silent)
-    cache[key] = params
 
     nn, kk, dd = params
     if not silent and dd is not None:
         merit = kk * dd**2 / nn
         print("", dims, exponents, (nn, kk, dd), f"{merit:.2f}")
 
+    return (dims, exponents, num_trials), params
+
+
+def is_known(
+    dims: tuple[int, int],
+    exponents: tuple[int, int, int, int],
+    min_rate: float,
+    num_trials: int,
+    cache: diskcache.Cache,
+) -> bool:
+    """Do we already have all the data we need for the given bivariate bicycle code?"""
+    key = (dims, exponents, num_trials)
+    if key not in cache:
+        return False
+    nn, kk, dd = cache[key]
+    # if we know the distance or the encoding rate is too low, there's nothing more to do
+    return dd is not None or kk < nn * min_rate
+
 
 def redundant_or_trivial(dims: tuple[int, int], exponents: tuple[int, int, int, int]) -> bool:
     """Is the given bivariate bicycle code redundant?"""
@@ -109,19 +129,69 @@ def redundant_or_trivial(dims: tuple[int, int], exponents: tuple[int, int, int,
     )
 
 
+def save_results(
+    jobs: Iterable[concurrent.futures.Future[JobResult]], cache: diskcache.Cache
+) -> BaseException | None:
+    """Save the results of all successful jobs to a cache, and return the first error (if any).
+
+    Jobs that were cancelled or have not finished are ignored.
+    """
+    error = None
+    for job in jobs:
+        if job.cancelled() or not job.done():
+            continue
+        if (job_error := job.exception()) is not None:
+            error = error or job_error
+            continue
+        key, params = job.result()
+        cache[key] = params
+    return error
+
+
 if __name__ == "__main__":
     dim_x = int(sys.argv[1])
 
     max_concurrent_jobs = num_cpus - 2 if (num_cpus := os.cpu_count()) else 1
     cache = qldpc.cache.get_disk_cache(CACHE_NAME, cache_dir=CACHE_DIR)
 
-    # run multiple jobs in parallel
-    with concurrent.futures.ProcessPoolExecutor(max_workers=max_concurrent_jobs) as executor:
-
-        for dim_y in range(MIN_ORDER, dim_x + 1):
-            dims = (dim_x, dim_y)
-            for exponents in itertools.product(
-                range(dim_x), range(dim_y), range(dim_x), range(dim_y)
-            ):
-                if not redundant_or_trivial(dims, exponents):
-                    executor.submit(run_and_save, dims, exponents, MIN_RATE, NUM_TRIALS, cache)
+    # run multiple jobs in parallel, keeping a bounded number of jobs in the job queue at a time
+    max_pending_jobs = 4 * max_concurrent_jobs
+    pending_jobs: set[concurrent.futures.Future[JobResult]] = set()
+
+    # start workers in fresh interpreters, rather than forking (and copying) the main process
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_concurrent_jobs,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
+
+        try:
+            for dim_y in range(MIN_ORDER, dim_x + 1):
+                dims = (dim_x, dim_y)
+                for exponents in itertools.product(
+                    range(dim_x), range(dim_y), range(dim_x), range(dim_y)
+                ):
+                    if redundant_or_trivial(dims, exponents) or is_known(
+                        dims, exponents, MIN_RATE, NUM_TRIALS, cache
+                    ):
+                        continue
+
+                    job = executor.submit(run_job, dims, exponents, MIN_RATE, NUM_TRIALS)
+                    pending_jobs.add(job)
+
+                    # if the job queue is full, wait for jobs to finish and save their results
+                    if len(pending_jobs) >= max_pending_jobs:
+                        done_jobs, pending_jobs = concurrent.futures.wait(
+                            pending_jobs, return_when=concurrent.futures.FIRST_COMPLETED
+                        )
+                        if error := save_results(done_jobs, cache):
+                            raise error
+
+        except BaseException:
+            # cancel all jobs that have not started, but save the results of jobs that were running
+            executor.shutdown(cancel_futures=True)
+            save_results(pending_jobs, cache)
+            raise
+
+        # wait for all remaining jobs to finish and save their results
+        if error := save_results(concurrent.futures.as_completed(pending_jobs), cache):
+            raise error
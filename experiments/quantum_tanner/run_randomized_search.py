@@ -15,16 +15,23 @@
    See the License for the specific language governing permissions and
    limitations under the License.
 """
-import concurrent.futures
+import functools
 import hashlib
+import multiprocessing
 import os
 from collections.abc import Hashable, Iterator
+from typing import Any
 
-from qldpc import abstract, codes
+# single-threaded linear algebra in worker processes (must be set before importing NumPy)
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+
+from qldpc import abstract, codes  # noqa: E402
 
 NUM_SAMPLES = 100  # per choice of group and subcode
 NUM_TRIALS = 1000  # for code distance calculations
 
+SAVE_DIR = os.path.join(os.path.dirname(__file__), "codes")
+
 
 def get_deterministic_hash(*inputs: Hashable, num_bytes: int = 4) -> int:
     """Get a deterministic hash from the given inputs."""
@@ -40,6 +47,12 @@ def get_small_groups(max_order: int = 20) -> Iterator[tuple[int, int]]:
             yield order, index
 
 
+@functools.cache
+def get_small_group(order: int, index: int) -> abstract.SmallGroup:
+    """Cached retrieval of a finite group by order and index."""
+    return abstract.SmallGroup(order, index)
+
+
 def get_cordaro_wagner_code(length: int) -> codes.ClassicalCode:
     """Cordaro Wagner code with a given block length."""
     return codes.ClassicalCode.from_name(f"CordaroWagnerCode({length})")
@@ -76,6 +89,7 @@ def run_and_save(
     group_index: int,
     base_code: codes.ClassicalCode,
     base_code_id: str,
+    base_code_bytes: bytes,
     sample: int,
     num_samples: int = NUM_SAMPLES,
     num_trials: int = NUM_TRIALS,
@@ -88,7 +102,8 @@ def run_and_save(
 
     The multiprocessing module (which calls this method) is unable to properly handle SymPy
     PermutationGroup objects, so we have to construct groups here from their order and index.
-    Passing ClassicalCode objects seems to be fine, though.
+    Passing ClassicalCode objects seems to be fine, though.  Groups are cached, so each worker
+    process only constructs any given group once.
     """
     if group_order < base_code.num_bits:
         # No subset of this group can be large enough to have as many elements as there are bits in
@@ -96,9 +111,9 @@ def run_and_save(
         return None
 
     group_id = f"SmallGroup-{group_order}-{group_index}"
-    seed = get_deterministic_hash(group_order, group_index, base_code.matrix.tobytes(), sample)
+    seed = get_deterministic_hash(group_order, group_index, base_code_bytes, sample)
     file = f"qtcode_{group_id}_{base_code_id}_s{seed}.txt"
-    path = os.path.join(save_dir, file)
+    path = os.path.join(SAVE_DIR, file)
 
     if os.path.isfile(path) and not override_existing_data:
         # we already have the data for this code, so there is nothing to do
@@ -109,7 +124,7 @@ def run_and_save(
         print(job_id)
 
     # construct a random code and compute its parameters
-    group = abstract.SmallGroup(group_order, group_index)
+    group = get_small_group(group_order, group_index)
     code = codes.QTCode.random(group, base_code, seed=seed)
     code_params = code.get_code_params(bound=num_trials)
     weight = code.get_weight()
@@ -130,30 +145,54 @@ def run_and_save(
         print(completion_text)
 
 
+def run_and_save_star(
+    args: tuple[int, int, codes.ClassicalCode, str, bytes, int, int, int], **kwargs: Any
+) -> None:
+    """Unpack positional arguments for run_and_save, for use with multiprocessing.Pool.imap."""
+    run_and_save(*args, **kwargs)
+
+
+def get_job_args(
+    num_samples: int = NUM_SAMPLES, num_trials: int = NUM_TRIALS
+) -> Iterator[tuple[int, int, codes.ClassicalCode, str, bytes, int, int, int]]:
+    """Iterator over the positional arguments of all calls to run_and_save."""
+    # construct all base codes (and serialize their parity check matrices) once, not once per group
+    base_codes = [
+        (base_code, base_code_id, base_code.matrix.tobytes())
+        for base_code, base_code_id in get_base_codes()
+    ]
+
+    # iterate over all combinations of group, base code, and sample index
+    for group_order, group_index in get_small_groups():
+        for base_code, base_code_id, base_code_bytes in base_codes:
+            for sample in range(num_samples):
+                yield (
+                    group_order,
+                    group_index,
+                    base_code,
+                    base_code_id,
+                    base_code_bytes,
+                    sample,
+                    num_samples,
+                    num_trials,
+                )
+
+                if base_code.num_bits == group_order:
+                    # There is only one instance of this random quantum Tanner code, namely the
+                    # one in which subset_a = subset_b = group, so we only need one sample.
+                    break
+
+
 if __name__ == "__main__":
     max_concurrent_jobs = num_cpus // 2 if (num_cpus := os.cpu_count()) else 1
-    save_dir = os.path.join(os.path.dirname(__file__), "codes")
-
-    # run multiple jobs in parallel
-    with concurrent.futures.ProcessPoolExecutor(max_workers=max_concurrent_jobs) as executor:
-
-        # iterate over all combinations of group, base code, and sample index
-        for group_order, group_index in get_small_groups():
-            for base_code, base_code_id in get_base_codes():
-                for sample in range(NUM_SAMPLES):
-
-                    # submit this job to the job queue
-                    executor.submit(
-                        run_and_save,
-                        group_order,
-                        group_index,
-                        base_code,
-                        base_code_id,
-                        sample,
-                        identify_completion_text=max_concurrent_jobs > 1,
-                    )
-
-                    if base_code.num_bits == group_order:
-                        # There is only one instance of this random quantum Tanner code, namely the
-                        # one in which subset_a = subset_b = group, so we only need one sample.
-                        break
+
+    # Run multiple jobs in parallel, handing a new batch of jobs to each worker as soon as it is
+    # free.  Batching jobs amortizes the cost of communicating with workers over several samples.
+    chunk_size = max(1, NUM_SAMPLES // (4 * max_concurrent_jobs))
+    job = functools.partial(run_and_save_star, identify_completion_text=max_concurrent_jobs > 1)
+
+    # start workers in fresh interpreters, rather than forking (and copying) the main process
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(processes=max_concurrent_jobs) as pool:
+        for _ in pool.imap_unordered(job, get_job_args(), chunksize=chunk_size):
+            pass
@@ -21,7 +21,7 @@ import os
 
 import run_randomized_search as search
 
-from qldpc import abstract, codes
+from qldpc import codes
 
 file_dir = os.path.dirname(__file__)
 save_dir = os.path.join(file_dir, "codes")
@@ -54,6 +54,6 @@ for pp, path in enumerate(paths):
     old_code = codes.QTCode.load(path)
 
     base_code = get_code(code_name, code_param)
-    group = abstract.SmallGroup(group_order, group_index)
+    group = search.get_small_group(group_order, group_index)
     new_code = codes.QTCode.random(group, base_code, seed=seed)
     assert old_code == new_code
@@ -446,7 +446,7 @@ class BBCode(TBCode):
         # Identify the plaquettes on which we need to examine check qubits.  If we have periodic
         # boundaries, all plaquettes "look the same", so we only need to consider one of them.
         # Otherwise, we generally need to consider all plaquettes.
-        plaquettes = [(0, 0)] if not open_boundaries else [*np.ndindex(*torus_shape)]
+        plaquettes = slice(None) if open_boundaries else slice(1)
 
         # build arrays that map plaquette coordinates to qubit coordinates for each qubit sector
         qubit_coords = {
@@ -454,37 +454,36 @@ class BBCode(TBCode):
             for sector in [0, 1] + PAULIS_XZ
         }
 
+        # coordinate maps for data qubits, indexed by (sector, plaquette coordinate)
+        data_coords_a = np.array([qubit_coords[sector][0] for sector in [0, 1]])
+        data_coords_b = np.array([qubit_coords[sector][1] for sector in [0, 1]])
+
         # sets of relative coordinates, organized by stabilizer type
         shifts: dict[PauliXZ, set[tuple[int, int]]] = {}
         for pauli in PAULIS_XZ:
-            shifts[pauli] = set()
 
             # organize checks by plaquette on the torus
             shape = (*torus_shape, 2, *torus_shape)
             checks = (matrix_x if pauli == Pauli.X else matrix_z).reshape(shape)
 
-            # loop over all plaquettes we need to consider
-            for p_a, p_b in plaquettes:
-
-                # identify the location of a check qubit, and the support of its stabilizer
-                c_a = qubit_coords[pauli][0][p_a]
-                c_b = qubit_coords[pauli][1][p_b]
+            # identify the locations of check qubits and the data qubits that they address
+            p_a, p_b, sector, q_a, q_b = np.nonzero(checks[plaquettes, plaquettes])
+            c_a = qubit_coords[pauli][0][p_a]
+            c_b = qubit_coords[pauli][1][p_b]
+            d_a = data_coords_a[sector, q_a]
+            d_b = data_coords_b[sector, q_b]
 
-                # identify the relative position of all data qubits addressed by this check
-                for sector, q_a, q_b in zip(*np.where(checks[p_a, p_b])):
-                    # relative position of this data qubit from the check qubit
-                    d_a = qubit_coords[sector][0][q_a]
-                    d_b = qubit_coords[sector][1][q_b]
-                    shift_a = d_a - c_a
-                    shift_b = d_b - c_b
+            # relative positions of data qubits from the check qubits that address them
+            shifts_a = d_a - c_a
+            shifts_b = d_b - c_b
 
-                    # account for periodic boundary conditions, if applicable
-                    if not open_boundaries:
-                        shift_a = (shift_a + torus_shape[0]) % (2 * torus_shape[0]) - torus_shape[0]
-                        shift_b = (shift_b + torus_shape[1]) % (2 * torus_shape[1]) - torus_shape[1]
+            # account for periodic boundary conditions, if applicable
+            if not open_boundaries:
+                shifts_a = (shifts_a + torus_shape[0]) % (2 * torus_shape[0]) - torus_shape[0]
+                shifts_b = (shifts_b + torus_shape[1]) % (2 * torus_shape[1]) - torus_shape[1]
 
-                    # record relative position
-                    shifts[pauli].add((shift_a, shift_b))
+            # record relative positions
+            shifts[pauli] = set(zip(shifts_a.tolist(), shifts_b.tolist()))
 
         return shifts[Pauli.X], shifts[Pauli.Z]
 
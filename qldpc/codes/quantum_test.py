@@ -103,6 +103,35 @@ def test_bivariate_bicycle_codes() -> None:
         codes.BBCode({}, poly_a, poly_b)
 
 
+def test_bivariate_bicycle_check_shifts() -> None:
+    """Relative positions of data qubits addressed by the checks of a bivariate bicycle code."""
+    from sympy.abc import x, y
+
+    # [[144, 12, 12]] code in Table 3 and Figure 2 of arXiv:2308.07915
+    code = codes.BBCode({x: 12, y: 6}, x**3 + y + y**2, y**3 + x + x**2)
+    plaquette_map, torus_shape = code.toric_layouts[0]
+    assert torus_shape == (12, 6)
+
+    # periodic boundary conditions
+    shifts_x, shifts_z = code.get_check_shifts(plaquette_map, torus_shape)
+    assert shifts_x == {(-1, 0), (0, -1), (0, 1), (1, 0), (-6, 3), (-3, -6)}
+    assert shifts_z == {(-1, 0), (0, -1), (0, 1), (1, 0), (3, -6), (6, -3)}
+
+    # open boundary conditions: shifts are symmetric under reflections about either axis
+    def reflect(shifts: set[tuple[int, int]]) -> set[tuple[int, int]]:
+        return {(s_a * aa, s_b * bb) for aa, bb in shifts for s_a in [1, -1] for s_b in [1, -1]}
+
+    shifts_x, shifts_z = code.get_check_shifts(plaquette_map, torus_shape, open_boundaries=True)
+    assert shifts_x == reflect(
+        {(0, 1), (0, 2), (1, 0), (2, 0), (1, 1), (1, 3), (1, 5), (1, 6), (1, 11)}
+        | {(6, 3), (6, 5), (6, 11), (7, 1), (7, 6), (9, 1), (9, 6), (12, 1), (12, 6)}
+    )
+    assert shifts_z == reflect(
+        {(0, 1), (0, 2), (1, 0), (2, 0), (1, 1), (1, 7), (1, 9), (3, 1), (3, 6)}
+        | {(5, 1), (5, 6), (6, 1), (6, 7), (6, 9), (11, 1), (11, 6), (12, 1), (12, 6)}
+    )
+
+
 @pytest.mark.parametrize("field", [2, 3])
 def test_hypergraph_products(
     field: int,